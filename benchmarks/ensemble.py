@@ -0,0 +1,80 @@
+"""
+Compares growing many small lattice aggregates with a single vectorized
+Ensemble against running independent Simulations in a process pool.
+
+Usage: python benchmarks/ensemble.py [members] [size] [particles] [workers]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dla import Ensemble, Simulation
+
+GRAVITY_FORCE = 0.5
+STEP_LENGTH = 5
+SPAWN_RADIUS = 50
+MOVING_PARTICLES = 100
+
+
+def grow_single(size, particles):
+    """
+    Grows a single aggregate, returns its number of solid particles
+    and fractal radius.
+    """
+    simulation = Simulation(
+        size, size, 1, (size // 2, size // 2),
+        GRAVITY_FORCE, STEP_LENGTH, SPAWN_RADIUS,
+        moving_particles_limit=MOVING_PARTICLES,
+        engine="lattice")
+    simulation.initialize()
+
+    max_radius = size // 2 - 2
+    while simulation.count_solid_particles() < particles and \
+            simulation.fractal_radius < max_radius:
+        simulation.update_particles()
+
+    return simulation.count_solid_particles(), simulation.fractal_radius
+
+
+def run_pool(members, size, particles, workers):
+    with ProcessPoolExecutor(workers) as pool:
+        results = list(pool.map(
+            grow_single, [size] * members, [particles] * members))
+    return [r[0] for r in results]
+
+
+def run_ensemble(members, size, particles):
+    ensemble = Ensemble(
+        members, size, size, (size // 2, size // 2),
+        GRAVITY_FORCE, STEP_LENGTH, SPAWN_RADIUS,
+        particles_limit=particles,
+        moving_particles_limit=MOVING_PARTICLES)
+    ensemble.initialize()
+    ensemble.run()
+    return list(ensemble.solid_particles)
+
+
+def main(members=256, size=200, particles=300, workers=os.cpu_count()):
+    print("{} members, {}x{}, {} particles each, {} workers".format(
+        members, size, size, particles, workers))
+
+    start = time.perf_counter()
+    counts = run_ensemble(members, size, particles)
+    ensemble_time = time.perf_counter() - start
+    print("ensemble:      {:8.2f} s  ({} particles)".format(
+        ensemble_time, sum(counts)))
+
+    start = time.perf_counter()
+    counts = run_pool(members, size, particles, workers)
+    pool_time = time.perf_counter() - start
+    print("process pool:  {:8.2f} s  ({} particles)".format(
+        pool_time, sum(counts)))
+
+    print("speedup:       {:8.2f}x".format(pool_time / ensemble_time))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
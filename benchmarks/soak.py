@@ -0,0 +1,276 @@
+"""
+Long-running soak test. Drives the simulation headlessly until the given
+number of sticking events, restarting the aggregate whenever it reaches the
+area's border, and samples throughput, memory and garbage collector
+statistics at fixed intervals into a CSV file.
+
+Fails (exit code 1) if throughput decays or memory grows beyond
+the configured thresholds.
+
+Usage: python benchmarks/soak.py --engine particles --events 100000
+"""
+import argparse
+import csv
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dla import Ensemble, Particle, Simulation
+
+COLUMNS = ["events", "elapsed_s", "events_per_s", "rss_mb", "objects",
+           "gc_collections", "gc_pause_ms", "restarts", "mask_cache_size"]
+
+
+def rss_mb():
+    """
+    Returns current resident set size in megabytes. Falls back to peak
+    resident set size where /proc is not available, and to NaN (memory
+    checks pass) where the resource module is not available either.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        try:
+            # Unix only
+            import resource
+        except ImportError:
+            return float("nan")
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+class GcMonitor:
+    """
+    Counts garbage collections and measures time spent in them.
+    """
+
+    def __init__(self):
+        self.collections = 0
+        self.pause = 0.
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            self.collections += 1
+            self.pause += time.perf_counter() - self._start
+            self._start = None
+
+    def take(self):
+        """
+        Returns collections count and pause time since the previous call.
+        """
+        result = self.collections, self.pause
+        self.collections, self.pause = 0, 0.
+        return result
+
+
+class SimulationDriver:
+    """
+    Grows aggregates of a single Simulation, restarting it when
+    the aggregate reaches the area's border.
+    """
+
+    def __init__(self, args):
+        self.simulation = Simulation(
+            args.size, args.size, args.radius,
+            (args.size // 2, args.size // 2),
+            args.gravity, args.step, args.spawn,
+            moving_particles_limit=args.moving,
+            engine=args.engine)
+        self.max_radius = args.size // 2 - args.radius - 2
+        self.restarts = 0
+        self.simulation.initialize()
+        self._solid = self.simulation.count_solid_particles()
+
+    def step(self):
+        """
+        Performs a single tick, returns number of new sticking events.
+        """
+        simulation = self.simulation
+        simulation.update_particles()
+
+        solid = simulation.count_solid_particles()
+        events, self._solid = solid - self._solid, solid
+
+        if simulation.fractal_radius >= self.max_radius:
+            simulation.initialize()
+            self._solid = simulation.count_solid_particles()
+            self.restarts += 1
+
+        return events
+
+
+class EnsembleDriver:
+    """
+    Grows aggregates of an Ensemble, restarting it when all members
+    reach the area's border.
+    """
+
+    def __init__(self, args):
+        self.ensemble = Ensemble(
+            args.members, args.size, args.size,
+            (args.size // 2, args.size // 2),
+            args.gravity, args.step, args.spawn,
+            moving_particles_limit=args.moving)
+        self.restarts = 0
+        self.ensemble.initialize()
+        self._solid = self.ensemble.solid_particles.sum()
+
+    def step(self):
+        ensemble = self.ensemble
+        running = ensemble.update()
+
+        solid = ensemble.solid_particles.sum()
+        events, self._solid = solid - self._solid, solid
+
+        if not running:
+            ensemble.initialize()
+            self._solid = ensemble.solid_particles.sum()
+            self.restarts += 1
+
+        return int(events)
+
+
+def check(samples, args):
+    """
+    Returns list of failed checks. Throughput and memory of the last quarter
+    of samples are compared with the first quarter after warm-up.
+    """
+    if len(samples) < 8:
+        return ["not enough samples ({}) to evaluate the run".format(len(samples))]
+
+    quarter = len(samples) // 4
+    # the first sample includes warm-up (imports, mask and field construction)
+    head, tail = samples[1:quarter + 1], samples[-quarter:]
+
+    def median(rows, column):
+        values = sorted(row[column] for row in rows)
+        return values[len(values) // 2]
+
+    failures = []
+
+    rate_head = median(head, "events_per_s")
+    rate_tail = median(tail, "events_per_s")
+    decay = 1 - rate_tail / rate_head
+    if decay > args.max_decay:
+        failures.append(
+            "throughput decayed by {:.0%} ({:.0f} -> {:.0f} events/s)".format(
+                decay, rate_head, rate_tail))
+
+    rss_growth = median(tail, "rss_mb") - median(head, "rss_mb")
+    if rss_growth > args.max_rss_growth:
+        failures.append("RSS grew by {:.1f} MB".format(rss_growth))
+
+    objects_head = median(head, "objects")
+    objects_growth = (median(tail, "objects") - objects_head) / objects_head
+    if objects_growth > args.max_objects_growth:
+        failures.append("Python object count grew by {:.0%}".format(objects_growth))
+
+    return failures
+
+
+def run(args):
+    if args.engine == "ensemble":
+        driver = EnsembleDriver(args)
+    else:
+        driver = SimulationDriver(args)
+
+    monitor = GcMonitor()
+    gc.callbacks.append(monitor)
+
+    samples = []
+    events = 0
+    next_sample = args.interval
+    start = last_time = time.perf_counter()
+    last_events = 0
+
+    with open(args.csv, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+
+        while events < args.events:
+            events += driver.step()
+            if events < next_sample:
+                continue
+
+            now = time.perf_counter()
+            collections, pause = monitor.take()
+            sample = {
+                "events": events,
+                "elapsed_s": round(now - start, 3),
+                "events_per_s": round((events - last_events) / (now - last_time), 1),
+                "rss_mb": round(rss_mb(), 2),
+                "objects": len(gc.get_objects()),
+                "gc_collections": collections,
+                "gc_pause_ms": round(pause * 1000, 3),
+                "restarts": driver.restarts,
+                "mask_cache_size": len(Particle.outer_mask),
+            }
+            writer.writerow(sample)
+            f.flush()
+            samples.append(sample)
+
+            if args.verbose:
+                print("{events:>9} events  {events_per_s:9.0f}/s  "
+                      "{rss_mb:8.1f} MB  {objects:>8} objects  "
+                      "{gc_pause_ms:8.1f} ms gc".format(**sample))
+
+            while next_sample <= events:
+                next_sample += args.interval
+            last_time = time.perf_counter()
+            last_events = events
+
+    gc.callbacks.remove(monitor)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--engine", choices=("particles", "lattice", "ensemble"),
+                        default="particles")
+    parser.add_argument("--events", type=int, default=100000,
+                        help="number of sticking events to simulate")
+    parser.add_argument("--interval", type=int, default=None,
+                        help="events between samples (default: events / 50)")
+    parser.add_argument("--csv", default="soak.csv", help="output CSV path")
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--radius", type=int, default=3)
+    parser.add_argument("--gravity", type=float, default=0.5)
+    parser.add_argument("--step", type=float, default=5)
+    parser.add_argument("--spawn", type=float, default=100)
+    parser.add_argument("--moving", type=int, default=100,
+                        help="moving particles limit (per member for ensemble)")
+    parser.add_argument("--members", type=int, default=64,
+                        help="number of ensemble members")
+    parser.add_argument("--max-decay", type=float, default=0.3,
+                        help="allowed relative throughput decay")
+    parser.add_argument("--max-rss-growth", type=float, default=50.,
+                        help="allowed RSS growth in MB")
+    parser.add_argument("--max-objects-growth", type=float, default=0.2,
+                        help="allowed relative growth of Python object count")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.interval is None:
+        args.interval = max(1, args.events // 50)
+
+    samples = run(args)
+    failures = check(samples, args)
+    for failure in failures:
+        print("FAIL: " + failure)
+    if not failures:
+        print("OK: {} events, {} samples written to {}".format(
+            samples[-1]["events"], len(samples), args.csv))
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
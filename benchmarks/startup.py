@@ -0,0 +1,64 @@
+"""
+Measures interpreter startup time needed to import the core package and
+the Qt interface, and checks that the core package does not load Qt.
+
+Usage: python benchmarks/startup.py [repeats]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("bare interpreter", "pass"),
+    ("numpy", "import numpy"),
+    ("dla", "import dla"),
+    ("dla + simulation tick",
+     "import dla; s = dla.Simulation(200, 200, 3, (100, 100), 0.5, 5, 100); "
+     "s.initialize(); s.update_particles()"),
+    ("dla.gui", "import dla.gui"),
+    ("dla.gui.app (Qt)", "import dla.gui.app"),
+]
+
+
+def measure(code, repeats):
+    """
+    Returns median wall time of running given code in a fresh interpreter.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def loads_qt(module):
+    """
+    Checks whether importing given module loads PyQt5.
+    """
+    code = "import sys, {}; sys.exit('PyQt5' in sys.modules)".format(module)
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT).returncode != 0
+
+
+def main(repeats=5):
+    for label, code in CASES:
+        try:
+            elapsed = measure(code, repeats)
+        except subprocess.CalledProcessError:
+            print("{:<28} failed".format(label))
+            continue
+        print("{:<28} {:8.1f} ms".format(label, elapsed * 1000))
+
+    for module in ("dla", "dla.gui"):
+        if loads_qt(module):
+            print("error: importing {} loads PyQt5".format(module))
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
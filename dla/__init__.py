@@ -0,0 +1,11 @@
+"""
+Core of the DLA fractals simulation. Importing this package never loads Qt,
+the graphical interface lives in the dla.gui subpackage.
+"""
+
+from .simulation import Simulation
+from .particles import Particle
+from .lattice import LatticeEngine
+from .ensemble import Ensemble
+from .gravity import GravityField, PointSource, LineSource, UniformSource
+from .events import StickingLog
@@ -0,0 +1,368 @@
+from .gravity import GravityField, PointSource
+
+import numpy as np
+
+
+def biased_step_cdf(unit_steps, drift_x, drift_y):
+    """
+    Returns cumulative step distribution for every walker. Probability
+    of every step is proportional to 1 + its alignment with the walker's
+    drift vector, clipped at zero.
+    """
+    alignment = (np.outer(drift_x, unit_steps[:, 0]) +
+                 np.outer(drift_y, unit_steps[:, 1]))
+    weights = np.clip(1 + alignment, 0, None)
+
+    cdf = np.cumsum(weights, axis=1)
+    cdf /= cdf[:, -1:]
+    return cdf
+
+
+class Ensemble:
+    """
+    Grows many independent on-lattice aggregates with identical parameters
+    at once. Every walker occupies a single cell of its member's collision
+    map and moves by unit steps to one of 4 or 8 neighbouring cells.
+    Collision maps of all members are stacked into one (size, height, width)
+    array and walkers of all members are kept in shared flat arrays tagged
+    with their member's index, so a single vectorized tick advances
+    every member.
+    """
+
+    """Dict storing unit steps for every supported neighbourhood."""
+    directions = {
+        4: np.array([(1, 0), (0, 1), (-1, 0), (0, -1)]),
+        8: np.array([(1, 0), (1, 1), (0, 1), (-1, 1),
+                     (-1, 0), (-1, -1), (0, -1), (1, -1)]),
+    }
+
+    def __init__(self,
+                 size,
+                 width, height,
+                 gravity_center, gravity_force,
+                 rand_step_length,
+                 spawn_radius,
+                 particles_limit=-1,
+                 moving_particles_limit=100,
+                 connectivity=4,
+                 gravity_sources=None,
+                 seed=None,
+                 block_size=1 << 16
+                 ):
+        """
+        Initializes ensemble parameters
+        :param size:                number of simulated aggregates
+        :param width:               simulation area width
+        :param height:              simulation area height
+        :param gravity_center:      coordinates of gravity center
+        :param gravity_force:       value of gravity force
+        :param rand_step_length:    number of lattice steps made by each walker per tick
+        :param spawn_radius:        distance from the aggregate where the walkers are created
+        :param particles_limit:     number of particles created for every member (seeds
+                                    included), the member is finished once all of them
+                                    are solid; -1 to grow until the aggregate reaches
+                                    the area's border
+        :param moving_particles_limit:  number of walkers simulated for every member
+        :param connectivity:        number of neighbours (4 or 8)
+        :param gravity_sources:     list of gravity sources, defaults to a single
+                                    point source at the gravity center
+        :param seed:                seed of the ensemble's random generator,
+                                    numpy's global generator is used if not given
+        :param block_size:          number of random values drawn at once
+        """
+        if connectivity not in Ensemble.directions:
+            raise ValueError(
+                "connectivity must be 4 or 8, got {}".format(connectivity))
+
+        # static parameters
+        self.size = size
+        self.width = width
+        self.height = height
+
+        self.gravity_center = gravity_center
+        self.gravity_force = gravity_force
+        if gravity_sources is None:
+            gravity_sources = [PointSource(gravity_center[0], gravity_center[1])]
+        self.gravity_sources = gravity_sources
+
+        self.rand_step_length = rand_step_length
+        self.spawn_radius = spawn_radius
+        self.particles_limit = particles_limit
+        self.moving_particles_limit = moving_particles_limit
+        self.block_size = block_size
+
+        # number of draws per walker before a rejected spawn is postponed
+        # to the next tick
+        self.spawn_attempts = 16
+
+        self.steps = Ensemble.directions[connectivity]
+        self.unit_steps = self.steps / np.hypot(
+            self.steps[:, 0], self.steps[:, 1])[:, None]
+
+        self.random = np.random if seed is None else np.random.RandomState(seed)
+        self.gravity = GravityField(width, height)
+
+        # distance from the gravity center at which members stop growing
+        self.max_radius = min(
+            gravity_center[0], gravity_center[1],
+            width - 1 - gravity_center[0], height - 1 - gravity_center[1]) - 1
+
+        # dynamic parameters
+        self.collision_maps = None
+        self.neighbour_maps = None
+
+        self.walkers_k = np.empty(0, dtype=np.intp)
+        self.walkers_x = np.empty(0, dtype=np.intp)
+        self.walkers_y = np.empty(0, dtype=np.intp)
+
+        self.solid_particles = np.zeros(size, dtype=np.intp)
+        self.fractal_radius = np.zeros(size)
+        self.finished = np.zeros(size, dtype=bool)
+
+        # cells that became solid during the last tick, per member
+        self.new_solid_k = np.empty(0, dtype=np.intp)
+        self.new_solid_x = np.empty(0, dtype=np.intp)
+        self.new_solid_y = np.empty(0, dtype=np.intp)
+
+        self._random_block = np.empty(0)
+        self._random_index = 0
+        self._steps_block = np.empty(0, dtype=np.intp)
+        self._steps_index = 0
+
+    def initialize(self):
+        """
+        Creates clear initial state of every member.
+        """
+        shape = (self.size, self.height, self.width)
+        self.collision_maps = np.zeros(shape=shape, dtype=bool)
+        self.neighbour_maps = np.zeros(shape=shape, dtype=bool)
+        self.gravity.update(self.gravity_force, self.gravity_sources)
+
+        self.walkers_k = np.empty(0, dtype=np.intp)
+        self.walkers_x = np.empty(0, dtype=np.intp)
+        self.walkers_y = np.empty(0, dtype=np.intp)
+
+        seeds = [p for source in self.gravity_sources
+                 for p in source.seed_points(1)]
+        seeds = np.array(sorted(set(
+            (int(round(x)), int(round(y)))
+            for x, y in seeds or [self.gravity_center])))
+
+        members = np.repeat(np.arange(self.size), len(seeds))
+        self.new_solid_k = members
+        self.new_solid_x = np.tile(seeds[:, 0], self.size)
+        self.new_solid_y = np.tile(seeds[:, 1], self.size)
+        self._stamp(self.new_solid_k, self.new_solid_x, self.new_solid_y)
+
+        self.solid_particles = np.full(self.size, len(seeds), dtype=np.intp)
+        self.fractal_radius = np.zeros(self.size)
+        self.finished = np.zeros(self.size, dtype=bool)
+
+    def _random(self, count):
+        """
+        Returns count uniform random values taken from the pre-drawn block.
+        """
+        if self._random_index + count > len(self._random_block):
+            self._random_block = self.random.rand(max(self.block_size, count))
+            self._random_index = 0
+
+        values = self._random_block[self._random_index:self._random_index + count]
+        self._random_index += count
+        return values
+
+    def _random_steps(self, count):
+        """
+        Returns count uniformly chosen step indices taken from
+        the pre-drawn block.
+        """
+        if self._steps_index + count > len(self._steps_block):
+            self._steps_block = self.random.randint(
+                len(self.steps), size=max(self.block_size, count))
+            self._steps_index = 0
+
+        values = self._steps_block[self._steps_index:self._steps_index + count]
+        self._steps_index += count
+        return values
+
+    def _stamp(self, k, x, y):
+        """
+        Marks given cells of given members as solid and flags
+        all of their neighbours.
+        """
+        self.collision_maps[k, y, x] = True
+
+        nx = x[:, None] + self.steps[:, 0]
+        ny = y[:, None] + self.steps[:, 1]
+        nk = np.broadcast_to(k[:, None], nx.shape)
+        inside = (nx >= 0) & (nx < self.width) & (ny >= 0) & (ny < self.height)
+        self.neighbour_maps[nk[inside], ny[inside], nx[inside]] = True
+
+    def _keep_walkers(self, mask):
+        self.walkers_k = self.walkers_k[mask]
+        self.walkers_x = self.walkers_x[mask]
+        self.walkers_y = self.walkers_y[mask]
+
+    def _drop_surplus_walkers(self, moving, allowed):
+        """
+        Drops randomly chosen walkers of members that have more walkers
+        than allowed.
+        """
+        if (moving <= allowed).all():
+            return
+
+        order = np.lexsort((self._random(len(self.walkers_k)), self.walkers_k))
+        member = self.walkers_k[order]
+        rank = np.arange(len(order)) - np.searchsorted(member, member)
+
+        keep = np.empty(len(order), dtype=bool)
+        keep[order] = rank < allowed[member]
+        self._keep_walkers(keep)
+
+    def _produce_walkers(self):
+        """
+        Spawns new walkers (or drops surplus ones) for every unfinished
+        member, so that the number of its walkers matches the moving
+        particles limit without exceeding the particles limit.
+        """
+        allowed = np.full(self.size, self.moving_particles_limit, dtype=np.intp)
+        if self.particles_limit != -1:
+            allowed = np.minimum(
+                allowed, np.clip(self.particles_limit - self.solid_particles, 0, None))
+
+        moving = np.bincount(self.walkers_k, minlength=self.size)
+        self._drop_surplus_walkers(moving, allowed)
+
+        count = np.clip(allowed - moving, 0, None)
+        count[self.finished] = 0
+
+        k = np.repeat(np.arange(self.size), count)
+        for _ in range(self.spawn_attempts):
+            if len(k) == 0:
+                break
+            k = self._spawn(k)
+
+    def _spawn(self, k):
+        """
+        Places a walker of every given member at a random cell of the spawn
+        ring around its aggregate. The ring is at least one cell wide, so
+        that free cells can be drawn even with zero spawn radius.
+        Returns members whose cell was outside the area or already solid,
+        to be drawn again.
+        """
+        a = self.random.rand(len(k)) * 2 * np.pi
+        r = (self.random.rand(len(k)) * max(self.spawn_radius, 1) +
+             self.fractal_radius[k])
+        x = np.rint(self.gravity_center[0] + np.cos(a) * r).astype(np.intp)
+        y = np.rint(self.gravity_center[1] + np.sin(a) * r).astype(np.intp)
+
+        free = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        free[free] = ~self.collision_maps[k[free], y[free], x[free]]
+
+        self.walkers_k = np.concatenate((self.walkers_k, k[free]))
+        self.walkers_x = np.concatenate((self.walkers_x, x[free]))
+        self.walkers_y = np.concatenate((self.walkers_y, y[free]))
+        return k[~free]
+
+    def _make_step(self):
+        """
+        Moves every walker by a single lattice step. Steps leading outside
+        the simulation area are rejected. Without gravity step indices are
+        taken directly from the pre-drawn block.
+        """
+        if self.gravity_force == 0:
+            choice = self._random_steps(len(self.walkers_k))
+        else:
+            self.gravity.update(self.gravity_force, self.gravity_sources)
+            cdf = biased_step_cdf(
+                self.unit_steps,
+                self.gravity.field_x[self.walkers_y, self.walkers_x],
+                self.gravity.field_y[self.walkers_y, self.walkers_x])
+            u = self._random(len(self.walkers_k))
+            choice = (u[:, None] >= cdf).sum(axis=1)
+
+        nx = self.walkers_x + self.steps[choice, 0]
+        ny = self.walkers_y + self.steps[choice, 1]
+        inside = (nx >= 0) & (nx < self.width) & (ny >= 0) & (ny < self.height)
+
+        self.walkers_x = np.where(inside, nx, self.walkers_x)
+        self.walkers_y = np.where(inside, ny, self.walkers_y)
+
+    def _settle(self, new_solid):
+        """
+        Freezes every walker adjacent to its member's aggregate. Repeats
+        until no walker touches freshly stamped cells. Walkers landing on
+        an already solid cell are merged into it. Stamped cells are
+        appended to new_solid as (k, x, y) arrays.
+        """
+        while len(self.walkers_k) > 0:
+            stuck = self.neighbour_maps[
+                self.walkers_k, self.walkers_y, self.walkers_x]
+            if not stuck.any():
+                return
+
+            k = self.walkers_k[stuck]
+            x = self.walkers_x[stuck]
+            y = self.walkers_y[stuck]
+            self._keep_walkers(~stuck)
+
+            # only the first walker sticking to a given free cell is kept
+            cells = np.ravel_multi_index(
+                (k, y, x), self.collision_maps.shape)
+            _, first = np.unique(cells, return_index=True)
+            first = np.sort(first)
+            first = first[~self.collision_maps[k[first], y[first], x[first]]]
+            k, x, y = k[first], x[first], y[first]
+
+            self._stamp(k, x, y)
+            new_solid.append((k, x, y))
+            self.solid_particles += np.bincount(k, minlength=self.size)
+            np.maximum.at(
+                self.fractal_radius, k,
+                np.hypot(x - self.gravity_center[0], y - self.gravity_center[1]))
+
+    def _finish_members(self):
+        """
+        Marks members that reached the particles limit or the area's
+        border as finished and drops their walkers.
+        """
+        self.finished |= self.fractal_radius >= self.max_radius
+        if self.particles_limit != -1:
+            self.finished |= self.solid_particles >= self.particles_limit
+
+        self._keep_walkers(~self.finished[self.walkers_k])
+
+    def update(self):
+        """
+        Advances walkers of every unfinished member by one simulation tick.
+        Returns false if all members are finished, true otherwise.
+        """
+        self._produce_walkers()
+
+        new_solid = []
+        if len(self.walkers_k) > 0:
+            self._settle(new_solid)
+            for _ in range(max(1, int(round(self.rand_step_length)))):
+                if len(self.walkers_k) == 0:
+                    break
+                self._make_step()
+                self._settle(new_solid)
+
+        empty = np.empty(0, dtype=np.intp)
+        self.new_solid_k = np.concatenate([k for k, _, _ in new_solid] or [empty])
+        self.new_solid_x = np.concatenate([x for _, x, _ in new_solid] or [empty])
+        self.new_solid_y = np.concatenate([y for _, _, y in new_solid] or [empty])
+
+        self._finish_members()
+        return not self.finished.all()
+
+    def run(self, max_ticks=None):
+        """
+        Updates the ensemble until all members are finished or given
+        number of ticks has passed. Returns number of performed ticks.
+        """
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            ticks += 1
+            if not self.update():
+                break
+        return ticks
@@ -0,0 +1,63 @@
+import numpy as np
+
+
+class StickingLog:
+    """
+    Growable record of all particles that became solid during
+    the simulation, in the order they stuck.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Creates empty log with given initial capacity.
+        """
+        self._data = np.empty(shape=(capacity, 3))
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, required):
+        if required > len(self._data):
+            data = np.empty(shape=(max(required, 2 * len(self._data)), 3))
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+
+    def append(self, particles):
+        """
+        Records position and radius of every given particle.
+        """
+        if not particles:
+            return
+
+        required = self._size + len(particles)
+        self._reserve(required)
+        self._data[self._size:required] = [
+            (p.pos_x, p.pos_y, p.radius) for p in particles]
+        self._size = required
+
+    def extend(self, pos_x, pos_y, radius):
+        """
+        Records particles given as arrays of positions and radii.
+        """
+        required = self._size + len(pos_x)
+        self._reserve(required)
+        self._data[self._size:required, 0] = pos_x
+        self._data[self._size:required, 1] = pos_y
+        self._data[self._size:required, 2] = radius
+        self._size = required
+
+    def clear(self):
+        self._size = 0
+
+    @property
+    def pos_x(self):
+        return self._data[:self._size, 0]
+
+    @property
+    def pos_y(self):
+        return self._data[:self._size, 1]
+
+    @property
+    def radius(self):
+        return self._data[:self._size, 2]
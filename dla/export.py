@@ -0,0 +1,241 @@
+import struct
+import zlib
+
+import numpy as np
+
+
+class CollisionMapSource:
+    """
+    Image source rendering the collision map, each pixel upscaled
+    to a scale x scale block.
+    """
+
+    def __init__(self, collision_map):
+        self.collision_map = collision_map
+        self.height, self.width = np.shape(collision_map)
+
+    def render_rows(self, top, bottom, scale):
+        """
+        Returns boolean coverage of output rows [top, bottom) of the image
+        rendered at given scale. Row 0 is the top of the aggregate
+        as shown on the canvas.
+        """
+        rows = self.height - 1 - np.arange(top, bottom) // scale
+        strip = np.asarray(self.collision_map)[rows] > 0
+        return np.repeat(strip, scale, axis=1)
+
+
+class ParticleSource:
+    """
+    Image source rendering particles as discs of their own radius.
+    """
+
+    def __init__(self, width, height, pos_x, pos_y, radius):
+        """
+        Creates source from particle positions and radii given
+        in simulation coordinates.
+        """
+        self.width = width
+        self.height = height
+
+        order = np.argsort(pos_y)
+        self.pos_x = np.asarray(pos_x, dtype=float)[order]
+        self.pos_y = np.asarray(pos_y, dtype=float)[order]
+        self.radius = np.asarray(radius, dtype=float)[order]
+        self.max_radius = self.radius.max() if len(self.radius) else 0.
+
+    @staticmethod
+    def from_log(width, height, log):
+        """
+        Creates source containing every particle recorded in sticking log.
+        """
+        return ParticleSource(width, height, log.pos_x, log.pos_y, log.radius)
+
+    def render_rows(self, top, bottom, scale):
+        """
+        Returns boolean coverage of output rows [top, bottom) of the image
+        rendered at given scale. Row 0 is the top of the aggregate
+        as shown on the canvas. Every output pixel is sampled at its center.
+        """
+        strip = np.zeros(shape=(bottom - top, self.width * scale), dtype=bool)
+
+        # simulation y range covered by the strip, widened by the largest radius
+        y_low = self.height - bottom / scale - self.max_radius
+        y_high = self.height - top / scale + self.max_radius
+        first, last = np.searchsorted(self.pos_y, (y_low, y_high))
+
+        for px, py, r in zip(self.pos_x[first:last],
+                             self.pos_y[first:last],
+                             self.radius[first:last]):
+            row_from = max(top, int(np.floor((self.height - py - r) * scale)))
+            row_to = min(bottom, int(np.ceil((self.height - py + r) * scale)))
+            col_from = max(0, int(np.floor((px - r) * scale)))
+            col_to = min(self.width * scale, int(np.ceil((px + r) * scale)))
+            if row_from >= row_to or col_from >= col_to:
+                continue
+
+            ys = self.height - (np.arange(row_from, row_to) + 0.5) / scale
+            xs = (np.arange(col_from, col_to) + 0.5) / scale
+            strip[row_from - top:row_to - top, col_from:col_to] |= (
+                np.square(xs[None, :] - px) +
+                np.square(ys[:, None] - py) <= r * r)
+
+        return strip
+
+
+def simulation_source(simulation):
+    """
+    Returns image source best representing given simulation. Lattice cells
+    are exported from the collision map, off-lattice particles as discs.
+    """
+    if simulation.engine == "lattice":
+        return CollisionMapSource(simulation.collision_map)
+    return ParticleSource.from_log(
+        simulation.width, simulation.height, simulation.sticking_log)
+
+
+class PngWriter:
+    """
+    Streams two-color image into a PNG file row strip by row strip.
+    Pixels are stored as 1-bit palette indices.
+    """
+
+    def __init__(self, path, width, height, bg_color, fg_color):
+        self.file = open(path, "wb")
+        self.compressor = zlib.compressobj()
+
+        self.file.write(b"\x89PNG\r\n\x1a\n")
+        self._write_chunk(b"IHDR", struct.pack(
+            ">IIBBBBB", width, height, 1, 3, 0, 0, 0))
+        self._write_chunk(b"PLTE", bytes(bg_color) + bytes(fg_color))
+
+    def _write_chunk(self, kind, data):
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(kind)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+    def write_rows(self, rows):
+        packed = np.packbits(rows, axis=1)
+        # every row starts with filter type 0 (none)
+        data = np.hstack(
+            (np.zeros(shape=(len(packed), 1), dtype=np.uint8), packed))
+        chunk = self.compressor.compress(data.tobytes())
+        if chunk:
+            self._write_chunk(b"IDAT", chunk)
+
+    def close(self):
+        self._write_chunk(b"IDAT", self.compressor.flush())
+        self._write_chunk(b"IEND", b"")
+        self.file.close()
+
+
+class TiffWriter:
+    """
+    Streams two-color image into a TIFF file. Every row strip is written
+    as a separately deflated TIFF strip; the directory is written last.
+    """
+
+    def __init__(self, path, width, height, bg_color, fg_color, rows_per_strip):
+        self.file = open(path, "wb")
+        self.width = width
+        self.height = height
+        self.bg_color = bg_color
+        self.fg_color = fg_color
+        self.rows_per_strip = rows_per_strip
+
+        self.strip_offsets = []
+        self.strip_sizes = []
+
+        # little endian header, directory offset is patched on close
+        self.file.write(b"II*\x00\x00\x00\x00\x00")
+
+    def write_rows(self, rows):
+        data = zlib.compress(np.packbits(rows, axis=1).tobytes())
+        self.strip_offsets.append(self.file.tell())
+        self.strip_sizes.append(len(data))
+        self.file.write(data)
+
+    def _write_array(self, fmt, values):
+        """
+        Writes array of values word aligned, returns its offset.
+        Single LONG value is returned as is, since it fits the directory entry.
+        """
+        if fmt == "I" and len(values) == 1:
+            return values[0]
+
+        if self.file.tell() % 2:
+            self.file.write(b"\x00")
+        offset = self.file.tell()
+        self.file.write(struct.pack("<{}{}".format(len(values), fmt), *values))
+        return offset
+
+    def close(self):
+        color_map = [
+            c * 257 for channel in range(3)
+            for c in (self.bg_color[channel], self.fg_color[channel])]
+
+        # (tag, type, count, value or offset), types: 3 - SHORT, 4 - LONG
+        entries = [
+            (256, 4, 1, self.width),
+            (257, 4, 1, self.height),
+            (258, 3, 1, 1),
+            (259, 3, 1, 8),
+            (262, 3, 1, 3),
+            (273, 4, len(self.strip_offsets),
+             self._write_array("I", self.strip_offsets)),
+            (277, 3, 1, 1),
+            (278, 4, 1, self.rows_per_strip),
+            (279, 4, len(self.strip_sizes),
+             self._write_array("I", self.strip_sizes)),
+            (320, 3, len(color_map), self._write_array("H", color_map)),
+        ]
+
+        if self.file.tell() % 2:
+            self.file.write(b"\x00")
+        directory = self.file.tell()
+        self.file.write(struct.pack("<H", len(entries)))
+        for tag, kind, count, value in entries:
+            if count == 1 and kind == 3:
+                # single SHORT value is left aligned in the value field
+                self.file.write(struct.pack("<HHIHH", tag, kind, count, value, 0))
+            else:
+                self.file.write(struct.pack("<HHII", tag, kind, count, value))
+        self.file.write(struct.pack("<I", 0))
+
+        self.file.seek(4)
+        self.file.write(struct.pack("<I", directory))
+        self.file.close()
+
+
+def export_image(path, source, scale=1,
+                 bg_color=(200, 200, 200), fg_color=(20, 20, 20),
+                 strip_rows=256):
+    """
+    Renders given image source at given integer scale and streams it into
+    a PNG or TIFF file (chosen by the file extension). Only strip_rows
+    output rows are kept in memory at once.
+    :param path:        output file path, ending with .png, .tif or .tiff
+    :param source:      CollisionMapSource or ParticleSource
+    :param scale:       number of output pixels per simulation pixel
+    :param bg_color:    (r, g, b) background color
+    :param fg_color:    (r, g, b) aggregate color
+    :param strip_rows:  number of output rows rendered at once
+    """
+    width = source.width * scale
+    height = source.height * scale
+
+    extension = path.lower().rsplit(".", 1)[-1]
+    if extension == "png":
+        writer = PngWriter(path, width, height, bg_color, fg_color)
+    elif extension in ("tif", "tiff"):
+        writer = TiffWriter(path, width, height, bg_color, fg_color, strip_rows)
+    else:
+        raise ValueError("unsupported image format: {}".format(path))
+
+    try:
+        for top in range(0, height, strip_rows):
+            bottom = min(height, top + strip_rows)
+            writer.write_rows(source.render_rows(top, bottom, scale))
+    finally:
+        writer.close()
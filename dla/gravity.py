@@ -0,0 +1,153 @@
+import numpy as np
+
+
+class PointSource:
+    """
+    Gravity source attracting particles towards a single point.
+    """
+
+    def __init__(self, x, y, weight=1.):
+        self.x = x
+        self.y = y
+        self.weight = weight
+
+    def drift(self, xs, ys, eps=0.0000001):
+        """
+        Returns unit vectors pointing from given positions towards
+        the source, scaled by the source's weight.
+        """
+        diff_x = self.x - xs
+        diff_y = self.y - ys
+        length = np.hypot(diff_x, diff_y)
+        scalar = np.where(length < eps, 0., self.weight / np.maximum(length, eps))
+        return diff_x * scalar, diff_y * scalar
+
+    def seed_points(self, spacing):
+        """
+        Returns positions of the seed particles the aggregate grows from.
+        """
+        return [(self.x, self.y)]
+
+
+class LineSource:
+    """
+    Gravity source attracting particles towards the nearest point
+    of a line segment, used for growth on a substrate.
+    """
+
+    def __init__(self, x0, y0, x1, y1, weight=1.):
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+        self.weight = weight
+
+    def drift(self, xs, ys, eps=0.0000001):
+        """
+        Returns unit vectors pointing from given positions towards the
+        nearest point of the segment, scaled by the source's weight.
+        """
+        seg_x = self.x1 - self.x0
+        seg_y = self.y1 - self.y0
+        seg_length = seg_x ** 2 + seg_y ** 2
+
+        if seg_length < eps:
+            t = 0.
+        else:
+            t = np.clip(((xs - self.x0) * seg_x + (ys - self.y0) * seg_y) /
+                        seg_length, 0., 1.)
+
+        return PointSource(
+            self.x0 + t * seg_x, self.y0 + t * seg_y, self.weight
+        ).drift(xs, ys, eps)
+
+    def seed_points(self, spacing):
+        """
+        Returns positions of the seed particles covering the segment.
+        """
+        length = np.hypot(self.x1 - self.x0, self.y1 - self.y0)
+        return [
+            (self.x0 + t * (self.x1 - self.x0), self.y0 + t * (self.y1 - self.y0))
+            for t in np.linspace(0., 1., int(length / spacing) + 1)
+        ]
+
+
+class UniformSource:
+    """
+    Gravity source applying the same drift vector everywhere.
+    """
+
+    def __init__(self, dir_x, dir_y):
+        self.dir_x = dir_x
+        self.dir_y = dir_y
+
+    def drift(self, xs, ys):
+        """
+        Returns the source's vector for every given position.
+        """
+        shape = np.broadcast(xs, ys).shape
+        return np.full(shape, float(self.dir_x)), np.full(shape, float(self.dir_y))
+
+    def seed_points(self, spacing):
+        return []
+
+
+class GravityField:
+    """
+    Precomputed gravity drift vectors for every pixel of the simulation area.
+    The field is the sum of drifts of all sources multiplied by the gravity
+    force and is rebuilt only when the force or the sources change.
+    Sources are compared by identity, so they should not be modified
+    in place once passed to the field.
+    """
+
+    def __init__(self, width, height):
+        """
+        Creates empty field of given size.
+        """
+        self.width = width
+        self.height = height
+
+        self.field_x = np.zeros(shape=(height, width))
+        self.field_y = np.zeros(shape=(height, width))
+
+        self._force = None
+        self._sources = None
+
+    def update(self, force, sources):
+        """
+        Rebuilds the field if given force or sources differ from the ones
+        used to build the current field.
+        Returns true if the field has been rebuilt.
+        """
+        if force == self._force and self._sources is not None and \
+                len(sources) == len(self._sources) and \
+                all(a is b for a, b in zip(sources, self._sources)):
+            return False
+
+        xs = np.arange(self.width, dtype=float)[None, :]
+        ys = np.arange(self.height, dtype=float)[:, None]
+
+        self.field_x.fill(0.)
+        self.field_y.fill(0.)
+        for source in sources:
+            fx, fy = source.drift(xs, ys)
+            self.field_x += fx
+            self.field_y += fy
+
+        self.field_x *= force
+        self.field_y *= force
+
+        self._force = force
+        self._sources = list(sources)
+        return True
+
+    def sample(self, xs, ys):
+        """
+        Returns drift vectors at given positions. Positions are rounded to
+        the nearest pixel, positions outside the simulation area use
+        the nearest border pixel.
+        """
+        ix = np.clip(np.rint(xs).astype(np.intp), 0, self.width - 1)
+        iy = np.clip(np.rint(ys).astype(np.intp), 0, self.height - 1)
+        return self.field_x[iy, ix], self.field_y[iy, ix]
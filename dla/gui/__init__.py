@@ -0,0 +1,19 @@
+"""
+Qt interface of the DLA fractals simulation.
+PyQt5 is imported only when the application is started.
+"""
+
+
+def main(argv=None):
+    """
+    Creates the application window and runs Qt event loop.
+    Returns application's exit code.
+    """
+    import sys
+    from PyQt5.QtWidgets import QApplication
+    from .app import App
+
+    app = QApplication(sys.argv if argv is None else argv)
+    window = App(40)
+    window.show()
+    return app.exec_()
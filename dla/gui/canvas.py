@@ -1,5 +1,6 @@
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QPainter, QPixmap, QColor
+from PyQt5.QtCore import QRectF
 
 
 class CanvasWidget(QWidget):
@@ -88,7 +89,7 @@ class CanvasWidget(QWidget):
         for p in filter(lambda o: o.solid, self.particles):
             left = p.pos_x - p.radius
             top = self.width - (p.pos_y + p.radius)
-            qp.drawEllipse(left, top, p.radius * 2, p.radius * 2)
+            qp.drawEllipse(QRectF(left, top, p.radius * 2, p.radius * 2))
 
     def _draw_moving_particles(self, qp):
         """
@@ -103,7 +104,7 @@ class CanvasWidget(QWidget):
         for p in filter(lambda o: not o.solid, self.particles):
             left = p.pos_x - p.radius
             top = self.width - (p.pos_y + p.radius)
-            qp.drawEllipse(left, top, p.radius * 2, p.radius * 2)
+            qp.drawEllipse(QRectF(left, top, p.radius * 2, p.radius * 2))
 
     def draw_widget(self, qp):
         """
@@ -0,0 +1,70 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtGui import QImage, QPixmap, QColor
+from PyQt5.QtCore import Qt
+
+import numpy as np
+
+from .customWidgets import LabeledSlider
+
+
+class ReplayWidget(QWidget):
+    """
+    Window showing recorded growth of an aggregate. The timeline slider
+    selects the number of sticking events shown.
+    """
+
+    def __init__(self, recording, bg_color=QColor(200, 200, 200),
+                 fg_color=QColor(20, 20, 20), max_size=700):
+        """
+        Initializes the widget showing the final stage of given recording.
+        """
+        super().__init__()
+
+        self.recording = recording
+        self.bg_color = bg_color
+        self.fg_color = fg_color
+        self.max_size = max_size
+
+        # kept alive as long as the image created from it is shown
+        self._image_data = None
+
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.image_label = QLabel(self)
+        self.image_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.image_label)
+
+        timeline_sl = LabeledSlider("Particles", 0, len(self.recording), self,
+                                    label_width=200, slider_width=400)
+        self.timeline_slider = timeline_sl.slider
+        self.timeline_slider.valueChanged.connect(self.timeline_slider_change)
+        layout.addWidget(timeline_sl)
+
+        self.setWindowTitle("DLA fractals - replay")
+
+        self.timeline_slider.setValue(len(self.recording))
+        self.timeline_slider_change(len(self.recording))
+
+    def timeline_slider_change(self, value):
+        """
+        Shows the aggregate after given number of sticking events.
+        """
+        occupancy = self.recording.seek(value)
+
+        # flipped vertically to match the live canvas
+        self._image_data = np.ascontiguousarray(
+            occupancy[::-1].astype(np.uint8))
+        height, width = self._image_data.shape
+
+        image = QImage(self._image_data.data, width, height, width,
+                       QImage.Format_Indexed8)
+        image.setColorTable([self.bg_color.rgb(), self.fg_color.rgb()])
+
+        pixmap = QPixmap.fromImage(image)
+        if max(width, height) > self.max_size:
+            pixmap = pixmap.scaled(self.max_size, self.max_size,
+                                   Qt.KeepAspectRatio)
+        self.image_label.setPixmap(pixmap)
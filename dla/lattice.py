@@ -0,0 +1,116 @@
+from .ensemble import Ensemble
+from .particles import Particle
+
+import numpy as np
+
+
+class LatticeEngine:
+    """
+    On-lattice variant of the simulation. Every walker occupies a single cell
+    of the collision map and moves by unit steps to one of 4 or 8
+    neighbouring cells. The lattice is grown by a single-member Ensemble
+    sharing the simulation's parameters and gravity field.
+    """
+
+    def __init__(self, simulation, connectivity=4, block_size=1 << 16):
+        """
+        Creates engine driving given simulation.
+        :param simulation:      simulation whose parameters are used
+        :param connectivity:    4 or 8, number of neighbours a walker can step to
+        :param block_size:      number of random values drawn at once
+        """
+        if connectivity not in Ensemble.directions:
+            raise ValueError(
+                "connectivity must be 4 or 8, got {}".format(connectivity))
+
+        self.simulation = simulation
+        self.connectivity = connectivity
+        self.block_size = block_size
+
+        # dynamic parameters
+        self.ensemble = None
+
+    def initialize(self):
+        """
+        Creates clear lattice state with seed cells defined by
+        the simulation's gravity sources. The simulation's collision map
+        is replaced with a view of the ensemble's one.
+        """
+        sim = self.simulation
+        self.ensemble = Ensemble(
+            1, sim.width, sim.height,
+            sim.gravity_center, sim.gravity_force,
+            sim.rand_step_length, sim.spawn_radius,
+            sim.particles_limit, sim.moving_particles_limit,
+            self.connectivity, sim.gravity_sources,
+            block_size=self.block_size)
+
+        # a single run keeps growing after reaching the area's border
+        self.ensemble.max_radius = np.inf
+        self.ensemble.gravity = sim.gravity
+        self.ensemble.initialize()
+
+        sim.collision_map = self.ensemble.collision_maps[0]
+        self._sync_simulation()
+
+    @property
+    def neighbour_map(self):
+        return self.ensemble.neighbour_maps[0]
+
+    @property
+    def walkers_x(self):
+        return self.ensemble.walkers_x
+
+    @property
+    def walkers_y(self):
+        return self.ensemble.walkers_y
+
+    @staticmethod
+    def _make_particle(x, y, solid):
+        """
+        Creates particle object representing given lattice cell.
+        """
+        p = Particle(x, y, 0.5)
+        p.solid = solid
+        return p
+
+    def _sync_ensemble(self):
+        """
+        Passes simulation parameters, which may be changed between ticks,
+        to the ensemble.
+        """
+        sim, ensemble = self.simulation, self.ensemble
+        ensemble.gravity_force = sim.gravity_force
+        ensemble.gravity_sources = sim.gravity_sources
+        ensemble.rand_step_length = sim.rand_step_length
+        ensemble.spawn_radius = sim.spawn_radius
+        ensemble.particles_limit = sim.particles_limit
+        ensemble.moving_particles_limit = sim.moving_particles_limit
+
+    def _sync_simulation(self):
+        """
+        Passes the ensemble's state after the last tick to the simulation.
+        """
+        sim, ensemble = self.simulation, self.ensemble
+        sim.new_solid_particles = [
+            self._make_particle(x, y, True)
+            for x, y in zip(ensemble.new_solid_x, ensemble.new_solid_y)]
+        sim.particles_count = int(ensemble.solid_particles[0]) + len(self.walkers_x)
+        sim.fractal_radius = float(ensemble.fractal_radius[0])
+
+    def moving_particles(self):
+        """
+        Returns list of particle objects representing all walkers.
+        """
+        return [self._make_particle(x, y, False)
+                for x, y in zip(self.walkers_x, self.walkers_y)]
+
+    def update(self):
+        """
+        Advances all walkers by one simulation tick.
+        Returns false once the particles limit is reached, true otherwise.
+        """
+        self._sync_ensemble()
+        running = self.ensemble.update()
+        self._sync_simulation()
+        return running
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+def outer_mask_offsets(radius, collision_eps=0.9):
+    """
+    Returns (n, 2) array of offsets of points on a circle slightly larger
+    than the particle, probed by collision checks.
+    """
+    angles = np.linspace(0, 2 * np.pi, int(2 * np.pi * radius))
+    return (radius + collision_eps) * np.stack(
+        (np.cos(angles), np.sin(angles)), axis=1)
+
+
+def stamp_offsets(radius):
+    """
+    Returns (n, 2) array of integer offsets from the particle's pixel
+    covering every pixel the particle may mark when stamped.
+    """
+    reach = int(np.ceil(radius)) + 1
+    dy, dx = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+    return np.stack((dx.ravel(), dy.ravel()), axis=1)
+
+
+class MaskCache:
+    """
+    Bounded LRU cache of per-radius masks. Radii are quantized to given
+    resolution before lookup, so nearby radii share a single mask.
+    Resolution has to be below one pixel: collision probe boxes and
+    stamp offsets assume the mask's radius is within half a pixel
+    of the particle's radius.
+    """
+
+    def __init__(self, builder, resolution=0.1, maxsize=32):
+        """
+        Creates empty cache.
+        :param builder:     function creating mask for given radius
+                            (and any extra arguments passed to get)
+        :param resolution:  step to which radii are rounded
+        :param maxsize:     maximal number of stored masks
+        """
+        self._check_resolution(resolution)
+        self.builder = builder
+        self.resolution = resolution
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+        self._masks = OrderedDict()
+
+    def __len__(self):
+        return len(self._masks)
+
+    @staticmethod
+    def _check_resolution(resolution):
+        if not 0 < resolution < 1:
+            raise ValueError(
+                "resolution must be between 0 and 1, got {}".format(resolution))
+
+    def __getitem__(self, radius):
+        return self.get(radius)
+
+    def configure(self, resolution=None, maxsize=None):
+        """
+        Changes cache parameters and drops all stored masks.
+        """
+        if resolution is not None:
+            self._check_resolution(resolution)
+            self.resolution = resolution
+        if maxsize is not None:
+            self.maxsize = maxsize
+        self.clear()
+
+    def clear(self):
+        self._masks.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, radius, *args):
+        """
+        Returns mask for given radius quantized to the cache's resolution.
+        """
+        key = (int(round(radius / self.resolution)),) + args
+        mask = self._masks.get(key)
+
+        if mask is not None:
+            self.hits += 1
+            self._masks.move_to_end(key)
+            return mask
+
+        self.misses += 1
+        mask = self.builder(key[0] * self.resolution, *args)
+        self._masks[key] = mask
+        if len(self._masks) > self.maxsize:
+            self._masks.popitem(last=False)
+        return mask
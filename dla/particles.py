@@ -1,17 +1,19 @@
 from __future__ import division
 import numpy as np
 
+from .masks import MaskCache, outer_mask_offsets, stamp_offsets
+
 
 class Particle:
     """
     Represents a single particle that creates the fractal.
     """
 
-    """Dict storing all collision masks of particles of given size."""
-    outer_mask = {}
+    """Cache of collision masks of particles of given size."""
+    outer_mask = MaskCache(outer_mask_offsets)
 
-    """Dict storing all pixel stamps of particles of given size."""
-    pixel_stamp = {}
+    """Cache of pixel stamp offsets of particles of given size."""
+    pixel_stamp = MaskCache(stamp_offsets)
 
     def __init__(self, pos_x=0, pos_y=0, radius=1, collision_eps=0.9):
         """
@@ -25,55 +27,64 @@ class Particle:
         self.speed_x = 0
         self.speed_y = 0
         self.solid = False
-
-        if radius not in Particle.outer_mask:
-            angles = np.linspace(0, 2 * np.pi, 2 * np.pi * self.radius)
-            mask = [
-                ((np.cos(a) * (self.radius + collision_eps)),
-                 (np.sin(a) * (self.radius + collision_eps)))
-                for a in angles
-            ]
-            Particle.outer_mask[radius] = mask
+        self.collision_eps = collision_eps
 
     def check_pixel_collision(self, pixel_map):
         """
         Checks if the particle's circumference intersects with any
         marked pixel on given pixel_map.
         """
-        height = len(pixel_map)
-        width = len(pixel_map[0])
+        pixel_map = np.asarray(pixel_map)
+        height, width = pixel_map.shape
 
-        for mx, my in Particle.outer_mask[self.radius]:
-            x = int(round(self.pos_x + mx))
-            y = int(round(self.pos_y + my))
-            if x < 0 or x >= width or y < 0 or y >= height:
-                continue
+        mask = Particle.outer_mask.get(self.radius, self.collision_eps)
+        xs = np.rint(self.pos_x + mask[:, 0]).astype(np.intp)
+        ys = np.rint(self.pos_y + mask[:, 1]).astype(np.intp)
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
 
-            if pixel_map[y][x] > 0:
-                return True
+        if (pixel_map[ys[inside], xs[inside]] > 0).any():
+            return True
 
         if (0 < self.pos_x < width) and (0 < self.pos_y < height):
-            return pixel_map[int(self.pos_y)][int(self.pos_x)] > 0
+            return pixel_map[int(self.pos_y), int(self.pos_x)] > 0
 
         return False
 
-    def make_pixel_stamp(self, pixel_map):
+    def probe_box(self, diff_x=0, diff_y=0):
+        """
+        Returns pixel box (left, top, right, bottom) containing every pixel
+        probed by collision checks along the move by given vector.
+        """
+        # outer mask reaches radius + collision_eps, rounded to nearest pixel;
+        # its quantized radius differs from radius by less than half a pixel
+        reach = self.radius + self.collision_eps + 1
+        return (int(np.floor(min(self.pos_x, self.pos_x + diff_x) - reach)),
+                int(np.floor(min(self.pos_y, self.pos_y + diff_y) - reach)),
+                int(max(self.pos_x, self.pos_x + diff_x) + reach) + 1,
+                int(max(self.pos_y, self.pos_y + diff_y) + reach) + 1)
+
+    def make_pixel_stamp(self, pixel_map, occupancy=None):
         """
         Marks all pixels within the particle's range on given pixel map.
+        If occupancy pyramid is given, it is updated as well.
         """
-        height = len(pixel_map)
-        width = len(pixel_map[0])
+        height, width = np.shape(pixel_map)
 
         left = max(0, int(self.pos_x - self.radius))
         right = min(width, int(round(self.pos_x + self.radius) + 1))
         top = max(0, int(self.pos_y - self.radius))
         bottom = min(height, int(round(self.pos_y + self.radius) + 1))
 
-        for x in range(left, right):
-            for y in range(top, bottom):
-                if np.square(self.pos_x - x) + np.square(
-                                self.pos_y - y) <= np.square(self.radius):
-                    pixel_map[y][x] = 1
+        offsets = Particle.pixel_stamp[self.radius]
+        xs = int(np.floor(self.pos_x)) + offsets[:, 0]
+        ys = int(np.floor(self.pos_y)) + offsets[:, 1]
+        inside = ((xs >= 0) & (xs < width) & (ys >= 0) & (ys < height) &
+                  (np.square(self.pos_x - xs) + np.square(self.pos_y - ys) <=
+                   np.square(self.radius)))
+        pixel_map[ys[inside], xs[inside]] = 1
+
+        if occupancy is not None:
+            occupancy.mark(left, top, right, bottom)
 
     def move(self, diff_x, diff_y):
         """
@@ -139,22 +150,33 @@ class Particle:
                                 bottom <= self.pos_y + step_y <= top):
                     return step_x, step_y
 
-    def apply_collision(self, pixel_map):
+    def apply_collision(self, pixel_map, occupancy=None):
+        if occupancy is not None and occupancy.is_empty(*self.probe_box()):
+            return False
+
         if not self.check_pixel_collision(pixel_map):
             return False
 
-        self.make_pixel_stamp(pixel_map)
+        self.make_pixel_stamp(pixel_map, occupancy)
         self.solid = True
         return True
 
-    def make_step(self, pixel_map, random_step_length=0, boundaries=None):
+    def make_step(self, pixel_map, random_step_length=0, boundaries=None,
+                  occupancy=None):
         """
         Moves particle according to it's speed and adds random step
         of given length.
+        If occupancy pyramid is given, the whole step is skipped without
+        probing pixels when its bounding box is empty.
         """
         dx, dy = self.get_random_step(random_step_length, boundaries)
         dx += self.speed_x
         dy += self.speed_y
+
+        if occupancy is not None and occupancy.is_empty(*self.probe_box(dx, dy)):
+            self.move(dx, dy)
+            return
+
         v = np.sqrt(dx ** 2 + dy ** 2)
 
         prev_x = self.pos_x
@@ -163,9 +185,9 @@ class Particle:
         for dv in np.linspace(0., 1., num=int(v / self.radius) + 1):
             self.pos_x = prev_x + dv * dx
             self.pos_y = prev_y + dv * dy
-            if self.apply_collision(pixel_map):
+            if self.apply_collision(pixel_map, occupancy):
                 return
 
         self.pos_x = prev_x + dx
         self.pos_y = prev_y + dy
-        self.apply_collision(pixel_map)
+        self.apply_collision(pixel_map, occupancy)
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class OccupancyPyramid:
+    """
+    Hierarchy of downsampled "any occupied" maps built over a pixel map.
+    Cell (y, x) on level l is set if any pixel within the 2^l x 2^l block
+    it covers is marked. Used to reject collision probes far from
+    the aggregate without touching full resolution pixels.
+    """
+
+    def __init__(self, pixel_map):
+        """
+        Builds all levels from the current content of given pixel map.
+        Level 0 is the pixel map itself and is not stored.
+        """
+        self.pixel_map = pixel_map
+        self.levels = []
+
+        level = np.asarray(pixel_map) > 0
+        while level.shape[0] > 1 or level.shape[1] > 1:
+            level = self._downsample(level)
+            self.levels.append(level)
+
+    @staticmethod
+    def _downsample(level):
+        """
+        Returns map twice as small in each dimension where every cell
+        is set if any of its four children is set.
+        """
+        height, width = level.shape
+        padded = np.zeros((height + height % 2, width + width % 2), dtype=bool)
+        padded[:height, :width] = level
+        return padded.reshape(
+            padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).any(axis=(1, 3))
+
+    def mark(self, left, top, right, bottom):
+        """
+        Updates all levels after pixels within given box have been
+        stamped on the pixel map. Box bounds are in pixels, right and
+        bottom are exclusive.
+        """
+        if right <= left or bottom <= top:
+            return
+
+        below = self.pixel_map
+        for level in self.levels:
+            left, top = left // 2, top // 2
+            right, bottom = (right + 1) // 2, (bottom + 1) // 2
+
+            children = np.asarray(
+                below[2 * top:2 * bottom, 2 * left:2 * right]) > 0
+            block = np.zeros((2 * (bottom - top), 2 * (right - left)), dtype=bool)
+            block[:children.shape[0], :children.shape[1]] = children
+            level[top:bottom, left:right] = block.reshape(
+                bottom - top, 2, right - left, 2).any(axis=(1, 3))
+            below = level
+
+    def is_empty(self, left, top, right, bottom):
+        """
+        Checks whether no pixel within given box is marked. The box is
+        first tested on the level where it spans at most 2x2 cells, finer
+        levels are used only while the coarse cells are occupied.
+        Returns false if the box may contain marked pixels at full resolution.
+        """
+        height, width = np.shape(self.pixel_map)
+        left, top = max(0, int(left)), max(0, int(top))
+        right, bottom = min(width, int(right)), min(height, int(bottom))
+        if right <= left or bottom <= top:
+            return True
+
+        size = max(right - left, bottom - top)
+        start = min(len(self.levels), max(1, (size - 1).bit_length()))
+        for l in range(start, 0, -1):
+            level = self.levels[l - 1]
+            if not level[top >> l:((bottom - 1) >> l) + 1,
+                         left >> l:((right - 1) >> l) + 1].any():
+                return True
+
+        return False
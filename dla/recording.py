@@ -0,0 +1,131 @@
+from bisect import bisect_right
+import zlib
+
+import numpy as np
+
+from .events import StickingLog
+from .masks import stamp_offsets
+
+
+def stamp_discs(pixel_map, pos_x, pos_y, radius, chunk_size=4096):
+    """
+    Marks all pixels within given discs on given boolean pixel map.
+    Pixels are selected the same way as by Particle.make_pixel_stamp.
+    """
+    height, width = pixel_map.shape
+    for r in np.unique(radius):
+        selected = radius == r
+        xs, ys = pos_x[selected], pos_y[selected]
+
+        offsets = stamp_offsets(r)
+        dx, dy = offsets[:, 0], offsets[:, 1]
+
+        for start in range(0, len(xs), chunk_size):
+            cx = xs[start:start + chunk_size, None]
+            cy = ys[start:start + chunk_size, None]
+            px = np.floor(cx).astype(np.intp) + dx
+            py = np.floor(cy).astype(np.intp) + dy
+            inside = ((px >= 0) & (px < width) & (py >= 0) & (py < height) &
+                      (np.square(cx - px) + np.square(cy - py) <= r * r))
+            pixel_map[py[inside], px[inside]] = True
+
+
+class Recording:
+    """
+    Recorded growth of an aggregate: every sticking event in order, plus
+    compressed occupancy keyframes taken periodically during the run.
+    Any growth stage is restored from the nearest preceding keyframe and
+    the events recorded after it.
+    """
+
+    def __init__(self, width, height, keyframe_interval=1000):
+        """
+        Creates empty recording of a simulation area of given size.
+        :param keyframe_interval:   minimal number of events between keyframes
+        """
+        self.width = width
+        self.height = height
+        self.keyframe_interval = keyframe_interval
+
+        self.events = StickingLog()
+        self.keyframe_indices = [0]
+        self.keyframes = [self._compress(
+            np.zeros(shape=(height, width), dtype=bool))]
+
+    def __len__(self):
+        return len(self.events)
+
+    @staticmethod
+    def _compress(occupancy):
+        return zlib.compress(np.packbits(occupancy).tobytes())
+
+    def _decompress(self, data):
+        bits = np.unpackbits(np.frombuffer(zlib.decompress(data), dtype=np.uint8))
+        return bits[:self.width * self.height].reshape(
+            self.height, self.width).astype(bool)
+
+    def capture(self, simulation):
+        """
+        Records events that happened in given simulation since the previous
+        capture. Stores a keyframe of the collision map if at least
+        keyframe_interval events have passed since the last one.
+        Should be called after every simulation update.
+        """
+        log = simulation.sticking_log
+        start = len(self.events)
+        self.events.extend(log.pos_x[start:], log.pos_y[start:],
+                           log.radius[start:])
+
+        if len(self.events) - self.keyframe_indices[-1] >= self.keyframe_interval:
+            self.keyframe_indices.append(len(self.events))
+            self.keyframes.append(self._compress(simulation.collision_map > 0))
+
+    def seek(self, count):
+        """
+        Returns boolean occupancy map after the first count sticking events.
+        """
+        count = max(0, min(count, len(self.events)))
+        index = bisect_right(self.keyframe_indices, count) - 1
+
+        occupancy = self._decompress(self.keyframes[index])
+        start = self.keyframe_indices[index]
+        stamp_discs(occupancy,
+                    self.events.pos_x[start:count],
+                    self.events.pos_y[start:count],
+                    self.events.radius[start:count])
+        return occupancy
+
+    def save(self, path):
+        """
+        Writes the recording into given .npz file.
+        """
+        sizes = [len(k) for k in self.keyframes]
+        np.savez(
+            path,
+            shape=np.array([self.width, self.height, self.keyframe_interval]),
+            events=np.stack((self.events.pos_x, self.events.pos_y,
+                             self.events.radius), axis=1),
+            keyframe_indices=np.array(self.keyframe_indices),
+            keyframe_offsets=np.cumsum([0] + sizes),
+            keyframes=np.frombuffer(b"".join(self.keyframes), dtype=np.uint8))
+
+    @staticmethod
+    def load(path):
+        """
+        Reads recording from given .npz file.
+        """
+        with np.load(path) as data:
+            width, height, keyframe_interval = data["shape"]
+            recording = Recording(int(width), int(height), int(keyframe_interval))
+
+            events = data["events"]
+            recording.events.extend(events[:, 0], events[:, 1], events[:, 2])
+
+            offsets = data["keyframe_offsets"]
+            keyframes = data["keyframes"].tobytes()
+            recording.keyframe_indices = [int(i) for i in data["keyframe_indices"]]
+            recording.keyframes = [
+                keyframes[offsets[i]:offsets[i + 1]]
+                for i in range(len(offsets) - 1)]
+
+        return recording
@@ -0,0 +1,211 @@
+from .particles import Particle
+from .lattice import LatticeEngine
+from .pyramid import OccupancyPyramid
+from .gravity import GravityField, PointSource
+from .events import StickingLog
+from .walkers import WalkerBuffer
+
+import numpy as np
+
+
+class Simulation:
+    """
+    Performs fractal generating simulation, responsible for spawning new
+    random particles
+    """
+
+    def __init__(self,
+                 width, height,
+                 particle_radius,
+                 gravity_center, gravity_force,
+                 rand_step_length,
+                 spawn_radius,
+                 particles_limit=-1,
+                 moving_particles_limit=100,
+                 engine="particles",
+                 connectivity=4,
+                 gravity_sources=None
+                 ):
+        """
+        Initializes simulation parameters
+        :param width:               simulation area width
+        :param height:              simulation area height
+        :param particle_radius:     size of a single particle
+        :param gravity_center:      coordinates of gravity center
+        :param gravity_force:       value of gravity force
+        :param rand_step_length:    length of random step applied to each moving particle
+        :param spawn_radius:        distance from the gravity center where the particles are created
+        :param particles_limit:     number of all particles to be created during the simulation
+        :moving_particles_limit:    maximal number of moving particles that can be simulated
+        :param engine:              "particles" for the off-lattice model,
+                                    "lattice" for the on-lattice model
+        :param connectivity:        number of neighbours (4 or 8) used by the lattice engine
+        :param gravity_sources:     list of gravity sources (see gravity module) that
+                                    also define the seeds, defaults to a single
+                                    point source at the gravity center
+        """
+        if engine not in ("particles", "lattice"):
+            raise ValueError("unknown engine: {}".format(engine))
+
+        # static parameters
+        self.width = width
+        self.height = height
+        self.particle_radius = particle_radius
+
+        self.gravity_center = gravity_center
+        self.gravity_force = gravity_force
+        if gravity_sources is None:
+            gravity_sources = [PointSource(gravity_center[0], gravity_center[1])]
+        self.gravity_sources = gravity_sources
+
+        self.rand_step_length = rand_step_length
+
+        self.particles_limit = particles_limit
+        self.moving_particles_limit = moving_particles_limit
+
+        self.spawn_radius = spawn_radius
+
+        self.engine = engine
+        self.connectivity = connectivity
+
+        # dynamic parameters
+        self.collision_map = None
+        self.occupancy = None
+        self.gravity = None
+
+        self.walkers = WalkerBuffer(moving_particles_limit)
+        self.new_solid_particles = []
+        self.particles_count = 0
+
+        self.fractal_radius = 0
+        self.solid_particles = 0
+
+        self.sticking_log = StickingLog()
+
+        self.lattice = None
+
+    def initialize(self):
+        """
+        Creates clear initial simulation state.
+        """
+        self.collision_map = np.zeros(shape=(self.height, self.width))
+        self.gravity = GravityField(self.width, self.height)
+        self.gravity.update(self.gravity_force, self.gravity_sources)
+        self.sticking_log.clear()
+        self.walkers.clear()
+
+        if self.engine == "lattice":
+            self.lattice = LatticeEngine(self, self.connectivity)
+            self.lattice.initialize()
+            self.sticking_log.append(self.new_solid_particles)
+            return
+
+        self.occupancy = OccupancyPyramid(self.collision_map)
+
+        seeds = []
+        for x, y in self.seed_points(self.particle_radius):
+            seed = Particle(x, y, self.particle_radius)
+            seed.solid = True
+            seed.make_pixel_stamp(self.collision_map, self.occupancy)
+            seeds.append(seed)
+
+        self.new_solid_particles = seeds
+        self.particles_count = len(seeds)
+        self.fractal_radius = 0
+        self.sticking_log.append(seeds)
+
+    def seed_points(self, spacing):
+        """
+        Returns positions of the seed particles defined by gravity sources.
+        If no source defines any seed, single seed is placed at
+        the gravity center.
+        """
+        points = [p for source in self.gravity_sources
+                  for p in source.seed_points(spacing)]
+        return points or [tuple(self.gravity_center)]
+
+    @property
+    def moving_particles(self):
+        """
+        List of all currently moving particles.
+        """
+        if self.lattice is not None:
+            return self.lattice.moving_particles()
+        return self.walkers.particles()
+
+    def _produce_particles(self):
+        """
+        Fills free walker slots with new particles, or retires random
+        walkers if the moving particles limit has been lowered.
+        Returns false if no more particles can be created.
+        """
+        count = self.moving_particles_limit - len(self.walkers)
+        if self.particles_limit != -1:
+            count = min(count, self.particles_limit - self.particles_count)
+
+        if count < 0:
+            self.walkers.remove_random(-count)
+            self.particles_count += count
+
+        elif count > 0:
+            self.walkers.reserve(self.moving_particles_limit)
+
+            a = np.random.rand(count) * 2 * np.pi
+            r = np.random.rand(count) * self.spawn_radius + self.fractal_radius
+            xs = self.gravity_center[0] + np.cos(a) * r
+            ys = self.gravity_center[1] + np.sin(a) * r
+            self.walkers.fill([
+                Particle(x, y, self.particle_radius) for x, y in zip(xs, ys)])
+            self.particles_count += count
+
+        return (self.particles_limit == -1 or
+                self.particles_count < self.particles_limit)
+
+    def count_moving_particles(self):
+        if self.lattice is not None:
+            return len(self.lattice.walkers_x)
+        return len(self.walkers)
+
+    def count_solid_particles(self):
+        return self.particles_count - self.count_moving_particles()
+
+    def update_particles(self):
+        """
+        Moves all particles and checks collisions.
+        Returns false if there are no particles to move, true otherwise.
+        """
+        if self.lattice is not None:
+            running = self.lattice.update()
+            self.sticking_log.append(self.new_solid_particles)
+            return running
+
+        self._produce_particles()
+
+        if len(self.walkers) == 0:
+            self.new_solid_particles = []
+            return False
+
+        self.gravity.update(self.gravity_force, self.gravity_sources)
+        pos_x, pos_y = self.walkers.positions()
+        drift_x, drift_y = self.gravity.sample(pos_x, pos_y)
+
+        for i, p in enumerate(self.walkers):
+            p.apply_force(drift_x[i], drift_y[i])
+            p.make_step(self.collision_map, self.rand_step_length,
+                        occupancy=self.occupancy)
+            pos_x[i] = p.pos_x
+            pos_y[i] = p.pos_y
+
+        new_solid = self.walkers.retire_solid()
+
+        for p in new_solid:
+            fr = (p.pos_x - self.gravity_center[0])**2 + \
+                 (p.pos_y - self.gravity_center[1])**2
+            fr = np.sqrt(fr)
+            if fr > self.fractal_radius:
+                self.fractal_radius = fr
+
+        self.new_solid_particles = new_solid
+        self.sticking_log.append(new_solid)
+
+        return True
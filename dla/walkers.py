@@ -0,0 +1,104 @@
+import numpy as np
+
+
+class WalkerBuffer:
+    """
+    Fixed-capacity storage of moving particles. Live walkers occupy the
+    first len(buffer) slots; removing a walker moves the last live walker
+    into the freed slot, so no operation shifts the whole population.
+    Positions of live walkers are mirrored in preallocated arrays, so
+    the whole population can be sampled without building new lists.
+    """
+
+    def __init__(self, capacity):
+        """
+        Creates empty buffer with given number of preallocated slots.
+        """
+        self._slots = [None] * capacity
+        self._size = 0
+
+        self._pos_x = np.empty(capacity)
+        self._pos_y = np.empty(capacity)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._slots[i]
+
+    @property
+    def capacity(self):
+        return len(self._slots)
+
+    def reserve(self, capacity):
+        """
+        Makes sure that given number of walkers fits in the buffer.
+        The buffer grows at least twice at once and never shrinks,
+        so changing the limit back and forth costs amortised O(1).
+        """
+        if capacity > len(self._slots):
+            grown = max(capacity, 2 * len(self._slots))
+            self._slots.extend([None] * (grown - len(self._slots)))
+            self._pos_x = np.resize(self._pos_x, grown)
+            self._pos_y = np.resize(self._pos_y, grown)
+
+    def fill(self, particles):
+        """
+        Places given particles in free slots, growing the buffer if needed.
+        """
+        end = self._size + len(particles)
+        self.reserve(end)
+        self._slots[self._size:end] = particles
+        self._pos_x[self._size:end] = [p.pos_x for p in particles]
+        self._pos_y[self._size:end] = [p.pos_y for p in particles]
+        self._size = end
+
+    def remove(self, index):
+        """
+        Removes walker at given index by swapping the last live walker in.
+        """
+        self._size -= 1
+        self._slots[index] = self._slots[self._size]
+        self._slots[self._size] = None
+        self._pos_x[index] = self._pos_x[self._size]
+        self._pos_y[index] = self._pos_y[self._size]
+
+    def remove_random(self, count):
+        """
+        Removes given number of randomly chosen walkers.
+        """
+        count = min(count, self._size)
+        chosen = np.random.choice(self._size, count, replace=False)
+        # removing from the highest index never moves another chosen walker
+        for index in np.sort(chosen)[::-1]:
+            self.remove(index)
+
+    def retire_solid(self):
+        """
+        Removes all walkers that became solid and returns them.
+        """
+        solid = []
+        for i in range(self._size - 1, -1, -1):
+            if self._slots[i].solid:
+                solid.append(self._slots[i])
+                self.remove(i)
+        return solid
+
+    def positions(self):
+        """
+        Returns writable views of x and y positions of all live walkers,
+        valid until walkers are added or removed. Moving a particle does
+        not update them, new positions have to be written back by the caller.
+        """
+        return self._pos_x[:self._size], self._pos_y[:self._size]
+
+    def clear(self):
+        self._slots[:self._size] = [None] * self._size
+        self._size = 0
+
+    def particles(self):
+        """
+        Returns list of all live walkers.
+        """
+        return self._slots[:self._size]
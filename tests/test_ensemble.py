@@ -0,0 +1,27 @@
+import numpy as np
+
+from dla import Ensemble
+
+
+def test_zero_spawn_radius_finishes_every_member():
+    ensemble = Ensemble(8, 100, 100, (50, 50), 0.5, 5, 0,
+                        particles_limit=150, seed=0)
+    ensemble.initialize()
+    ensemble.run(max_ticks=1000)
+
+    assert ensemble.finished.all()
+    assert (ensemble.solid_particles == 150).all()
+
+
+def test_spawns_outside_area_are_redrawn():
+    ensemble = Ensemble(1, 100, 100, (10, 50), 0, 5, 60,
+                        moving_particles_limit=5000, seed=0)
+    ensemble.initialize()
+    ensemble._produce_walkers()
+
+    distance = np.hypot(ensemble.walkers_x - 10, ensemble.walkers_y - 50)
+    assert len(ensemble.walkers_x) == 5000
+    assert distance.max() < 60 + 1
+    # clipped samples would pile up on the left border
+    border = (ensemble.walkers_x == 0).sum()
+    assert border < 2 * (ensemble.walkers_x == 1).sum()
@@ -0,0 +1,49 @@
+import struct
+import zlib
+
+import numpy as np
+
+from dla import Simulation
+from dla.export import export_image, simulation_source
+
+
+def read_png_rows(path, width):
+    """
+    Decodes 1-bit palette PNG written by PngWriter into boolean rows.
+    """
+    with open(path, "rb") as f:
+        data = f.read()[8:]
+
+    compressed = b""
+    while data:
+        length, kind = struct.unpack(">I4s", data[:8])
+        if kind == b"IDAT":
+            compressed += data[8:8 + length]
+        data = data[12 + length:]
+
+    raw = np.frombuffer(zlib.decompress(compressed), dtype=np.uint8)
+    rows = raw.reshape(-1, (width + 7) // 8 + 1)[:, 1:]
+    return np.unpackbits(rows, axis=1)[:, :width].astype(bool)
+
+
+def grow_lattice(ticks=200):
+    np.random.seed(0)
+    simulation = Simulation(120, 90, 1, (60, 45), 0.5, 5, 20,
+                            engine="lattice")
+    simulation.initialize()
+    for _ in range(ticks):
+        simulation.update_particles()
+    return simulation
+
+
+def test_lattice_export_matches_collision_map(tmp_path):
+    simulation = grow_lattice()
+    expected = simulation.collision_map[::-1] > 0
+    assert expected.sum() > 1
+
+    source = simulation_source(simulation)
+    assert (source.render_rows(0, simulation.height, 1) == expected).all()
+
+    path = str(tmp_path / "lattice.png")
+    export_image(path, source, scale=1, strip_rows=16)
+    assert (read_png_rows(path, simulation.width) == expected).all()
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from dla import Particle
+from dla.masks import MaskCache, outer_mask_offsets
+
+
+@pytest.mark.parametrize("resolution", [0, -0.1, 1, 2])
+def test_resolution_of_a_pixel_or_more_is_rejected(resolution):
+    with pytest.raises(ValueError):
+        MaskCache(outer_mask_offsets, resolution=resolution)
+    with pytest.raises(ValueError):
+        MaskCache(outer_mask_offsets).configure(resolution=resolution)
+
+
+def test_probe_box_contains_quantized_outer_mask():
+    rng = np.random.RandomState(0)
+    Particle.outer_mask.configure(resolution=0.9)
+    try:
+        for _ in range(2000):
+            p = Particle(rng.rand() * 100, rng.rand() * 100, rng.rand() * 8 + 0.5)
+            left, top, right, bottom = p.probe_box()
+
+            mask = Particle.outer_mask.get(p.radius, p.collision_eps)
+            xs = np.rint(p.pos_x + mask[:, 0])
+            ys = np.rint(p.pos_y + mask[:, 1])
+            assert (left <= xs).all() and (xs < right).all()
+            assert (top <= ys).all() and (ys < bottom).all()
+    finally:
+        Particle.outer_mask.configure(resolution=0.1)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from dla import Particle, Simulation
+from dla.pyramid import OccupancyPyramid
+
+
+def test_culled_steps_match_full_resolution_steps():
+    np.random.seed(0)
+    simulation = Simulation(160, 130, 2.5, (80, 65), 0.5, 5, 20,
+                            particles_limit=300)
+    simulation.initialize()
+    while simulation.update_particles():
+        pass
+
+    culled_map = simulation.collision_map.copy()
+    full_map = simulation.collision_map.copy()
+    occupancy = OccupancyPyramid(culled_map)
+
+    rng = np.random.RandomState(1)
+    stuck = 0
+    for i in range(3000):
+        a = rng.rand() * 2 * np.pi
+        r = rng.rand() * (simulation.fractal_radius + 10)
+        x = 80 + np.cos(a) * r
+        y = 65 + np.sin(a) * r
+        radius = rng.rand() * 3 + 0.5
+        speed_x, speed_y = rng.randn(2)
+
+        culled = Particle(x, y, radius)
+        full = Particle(x, y, radius)
+        for p in (culled, full):
+            p.speed_x, p.speed_y = speed_x, speed_y
+
+        np.random.seed(i)
+        culled.make_step(culled_map, 5, occupancy=occupancy)
+        np.random.seed(i)
+        full.make_step(full_map, 5)
+
+        assert (culled.pos_x, culled.pos_y) == (full.pos_x, full.pos_y)
+        assert culled.solid == full.solid
+        stuck += culled.solid
+
+    assert stuck > 100
+    assert np.array_equal(culled_map, full_map)
+
+    rebuilt = OccupancyPyramid(culled_map)
+    assert len(occupancy.levels) == len(rebuilt.levels)
+    for level, expected in zip(occupancy.levels, rebuilt.levels):
+        assert np.array_equal(level, expected)
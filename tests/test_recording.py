@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from dla import Simulation
+from dla.recording import Recording
+
+
+@pytest.mark.parametrize("engine, radius", [("particles", 2.5), ("lattice", 1)])
+def test_seek_reproduces_collision_map(tmp_path, engine, radius):
+    np.random.seed(0)
+    simulation = Simulation(150, 150, radius, (75, 75), 0.5, 5, 30,
+                            particles_limit=400, moving_particles_limit=40,
+                            engine=engine)
+    simulation.initialize()
+
+    recording = Recording(150, 150, keyframe_interval=25)
+    recording.capture(simulation)
+    stages = {len(recording): simulation.collision_map > 0}
+
+    for _ in range(2000):
+        running = simulation.update_particles()
+        recording.capture(simulation)
+        stages[len(recording)] = simulation.collision_map > 0
+        if not running:
+            break
+
+    assert len(recording.keyframes) > 5
+
+    path = str(tmp_path / "recording.npz")
+    recording.save(path)
+    loaded = Recording.load(path)
+
+    for count, occupancy in stages.items():
+        assert np.array_equal(recording.seek(count), occupancy)
+        assert np.array_equal(loaded.seek(count), occupancy)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from dla import Simulation
+
+
+@pytest.mark.parametrize("engine", ["particles", "lattice"])
+def test_sticking_log_has_no_duplicates_after_run_ends(engine):
+    np.random.seed(0)
+    simulation = Simulation(200, 200, 2, (100, 100), 0.5, 5, 20,
+                            particles_limit=60, moving_particles_limit=20,
+                            engine=engine)
+    simulation.initialize()
+
+    for _ in range(10000):
+        if not simulation.update_particles():
+            break
+    for _ in range(10):
+        simulation.update_particles()
+
+    assert len(simulation.sticking_log) == simulation.count_solid_particles()
+
+
+def test_walker_positions_follow_particles():
+    np.random.seed(0)
+    simulation = Simulation(200, 200, 2, (100, 100), 0.5, 5, 20,
+                            moving_particles_limit=30)
+    simulation.initialize()
+
+    for limit in (30, 30, 10, 10, 40, 40):
+        simulation.moving_particles_limit = limit
+        simulation.update_particles()
+
+        pos_x, pos_y = simulation.walkers.positions()
+        particles = simulation.moving_particles
+        assert np.array_equal(pos_x, [p.pos_x for p in particles])
+        assert np.array_equal(pos_y, [p.pos_y for p in particles])
+
+
+@pytest.mark.parametrize("engine", ["particles", "lattice"])
+def test_zero_spawn_radius_grows_to_limit(engine):
+    np.random.seed(0)
+    simulation = Simulation(200, 200, 2, (100, 100), 0.5, 5, 0,
+                            particles_limit=100, engine=engine)
+    simulation.initialize()
+
+    for _ in range(1000):
+        if not simulation.update_particles():
+            break
+
+    assert simulation.count_solid_particles() == 100